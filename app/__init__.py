@@ -1,12 +1,25 @@
+import time
+
 from flask import Flask
+from .asgi import create_asgi_app
+from .cli import configure_cli
+from .metrics import configure_metrics, record_startup
 from .routes import configure_routes
+from .startup import configure_warm_up, preload, preload_enabled
 
 
 def create_app():
+    started = time.perf_counter()
     app = Flask(__name__)
     app.config['SECRET_KEY'] = 'change-me'
+    configure_metrics(app)
     configure_routes(app)
+    configure_cli(app)
+    configure_warm_up(app)
+    if preload_enabled():
+        preload(app)
+    record_startup(time.perf_counter() - started)
     return app
 
 
-__all__ = ["create_app"]
+__all__ = ["create_app", "create_asgi_app"]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask
+from itsdangerous import BadSignature
+from werkzeug.http import parse_cookie
+
+from . import metrics
+from .startup import warm_up_once
+from .services import (
+    AssessmentForbidden,
+    AssessmentNotFound,
+    InsightService,
+    User,
+    get_all_assessments_async,
+    get_insight_service,
+    get_visible_assessment_async,
+    user_from_session,
+    visible_assessments,
+)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+# (method, pattern, route label used for metrics, handler name)
+_NATIVE_ROUTES: List[Tuple[str, "re.Pattern[str]", str, str]] = [
+    ("GET", re.compile(r"^/api/assessments$"), "/api/assessments", "assessments"),
+    (
+        "GET",
+        re.compile(r"^/api/assessments/(?P<assessment_id>[^/]+)$"),
+        "/api/assessments/<assessment_id>",
+        "assessment_detail",
+    ),
+    ("GET", re.compile(r"^/api/insights/(?P<assessment_id>[^/]+)$"), "/api/insights/<assessment_id>", "insights"),
+]
+
+
+class AsyncApp:
+    """ASGI application serving the JSON API natively and everything else through Flask.
+
+    The assessment and insight endpoints are awaited on the event loop, so slow
+    Gemini calls and storage reads do not hold a thread. All other routes
+    (HTML pages, forms, ``/metrics``) run in the wrapped Flask app on a
+    bounded thread pool.
+    """
+
+    def __init__(self, flask_app: Flask, fallback: ASGIApp):
+        self.flask_app = flask_app
+        self.fallback = fallback
+        self._serializer = flask_app.session_interface.get_signing_serializer(flask_app)  # type: ignore[attr-defined]
+        self._cookie_name = flask_app.config["SESSION_COOKIE_NAME"]
+        self._max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            for method, pattern, route, handler in _NATIVE_ROUTES:
+                match = pattern.match(scope["path"])
+                if match and scope["method"] == method:
+                    await self._dispatch(scope, send, route, handler, match.groupdict())
+                    return
+        await self.fallback(scope, receive, send)
+
+    async def _dispatch(self, scope: Scope, send: Send, route: str, handler: str, params: Dict[str, str]) -> None:
+        started = time.perf_counter()
+        status = 500
+        warm_up_once()
+        try:
+            user = self._current_user(scope)
+            if not user:
+                status = 302
+                await self._redirect(send, scope.get("root_path", "") + "/login")
+                return
+            try:
+                status, payload = await getattr(self, f"_{handler}")(user, **params)
+            except AssessmentNotFound:
+                status, payload = 404, {"error": "Not found"}
+            except AssessmentForbidden:
+                status, payload = 403, {"error": "Forbidden"}
+            await self._json(send, status, payload)
+        finally:
+            metrics.record_request(scope["method"], route, status, time.perf_counter() - started)
+
+    def _current_user(self, scope: Scope) -> Optional[User]:
+        cookies: Dict[str, str] = {}
+        for name, value in scope.get("headers", []):
+            if name == b"cookie":
+                cookies.update(parse_cookie(value.decode("latin-1")))
+        cookie = cookies.get(self._cookie_name)
+        if not cookie or self._serializer is None:
+            return None
+        try:
+            data = self._serializer.loads(cookie, max_age=self._max_age)
+        except BadSignature:
+            return None
+        return user_from_session(data)
+
+    async def _assessments(self, user: User) -> Tuple[int, Any]:
+        assessments = visible_assessments(user, await get_all_assessments_async())
+        return 200, [a.to_dict() for a in assessments]
+
+    async def _assessment_detail(self, user: User, assessment_id: str) -> Tuple[int, Any]:
+        assessment = await get_visible_assessment_async(assessment_id, user)
+        return 200, assessment.to_dict()
+
+    async def _insights(self, user: User, assessment_id: str) -> Tuple[int, Any]:
+        assessment = await get_visible_assessment_async(assessment_id, user)
+        insight_service: InsightService = get_insight_service()
+        content = await insight_service.generate_insight_async(assessment)
+        return 200, {"content": content}
+
+    async def _json(self, send: Send, status: int, payload: Any) -> None:
+        body = (self.flask_app.json.dumps(payload, separators=(",", ":")) + "\n").encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _redirect(self, send: Send, location: str) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 302,
+            "headers": [(b"location", location.encode("utf-8")), (b"content-length", b"0")],
+        })
+        await send({"type": "http.response.body", "body": b""})
+
+
+def create_asgi_app(flask_app: Optional[Flask] = None) -> AsyncApp:
+    from a2wsgi import WSGIMiddleware  # type: ignore
+
+    if flask_app is None:
+        from . import create_app
+
+        flask_app = create_app()
+    workers = int(os.environ.get("LEADERSHIP_APP_ASGI_THREADS", "10"))
+    return AsyncApp(flask_app, WSGIMiddleware(flask_app, workers=workers))
+
+
+__all__ = ["AsyncApp", "create_asgi_app"]
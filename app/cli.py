@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import click
+from flask import Flask
+
+from .domain import MANAGEMENT_LEVELS
+from .reports import pdf_support_available, select_assessments, write_reports_zip
+from .services import ensure_seed_users, get_all_assessments
+
+
+def configure_cli(app: Flask) -> None:
+    @app.cli.command("seed-users")
+    def seed_users() -> None:
+        """Create the demo master and standard accounts if no users exist yet."""
+        if ensure_seed_users():
+            click.echo("Created seed users.")
+        else:
+            click.echo("Users already exist; nothing to do.")
+
+    @app.cli.command("export-reports")
+    @click.option("--output", "-o", required=True, help="ZIP file to write, or '-' for stdout.")
+    @click.option("--category", default=None, help="Only include assessments in this category.")
+    @click.option("--management-level", type=click.Choice(MANAGEMENT_LEVELS), default=None)
+    @click.option("--assessed-by", default=None, help="Only include assessments by this assessor email.")
+    @click.option("--pdf", is_flag=True, help="Also render PDF reports (requires weasyprint).")
+    @click.option("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    def export_reports(
+        output: str,
+        category: Optional[str],
+        management_level: Optional[str],
+        assessed_by: Optional[str],
+        pdf: bool,
+        workers: Optional[int],
+    ) -> None:
+        """Render printable reports for a filtered set of assessments into a ZIP archive."""
+        if pdf and not pdf_support_available():
+            raise click.UsageError("--pdf requires the optional 'weasyprint' package.")
+        assessments = select_assessments(
+            get_all_assessments(),
+            category=category,
+            management_level=management_level,
+            assessed_by=assessed_by,
+        )
+        if output == "-":
+            count = write_reports_zip(assessments, sys.stdout.buffer, pdf=pdf, workers=workers)
+        else:
+            # Write next to the target and rename on success, so a failed export leaves no partial file.
+            target = Path(output)
+            partial = target.with_name(f".{target.name}.partial")
+            try:
+                with partial.open("wb") as fileobj:
+                    count = write_reports_zip(assessments, fileobj, pdf=pdf, workers=workers)
+                os.replace(partial, target)
+            finally:
+                partial.unlink(missing_ok=True)
+        click.echo(f"Exported {count} reports.", err=True)
+
+
+__all__ = ["configure_cli"]
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import math
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from . import metrics, storage
+from .domain import ALL_DIMENSIONS, calculate_scores
+from .services import Assessment, get_all_assessments
+
+PersonKey = Tuple[str, str]
+
+# Largest possible population standard deviation on a 1-5 scale.
+_MAX_SPREAD = 2.0
+
+
+def _normalize(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+def person_key(full_name: str, position: str) -> PersonKey:
+    return _normalize(full_name), _normalize(position)
+
+
+def is_complete(assessment: Assessment) -> bool:
+    """Whether every dimension has a score on the 1-5 scale; only such records are consolidated."""
+    return all(
+        isinstance(assessment.dimensions.get(dim), int) and 1 <= assessment.dimensions[dim] <= 5
+        for dim in ALL_DIMENSIONS
+    )
+
+
+@dataclass
+class ConsolidatedPerson:
+    key: PersonKey
+    full_name: str
+    position: str
+    management_level: str
+    assessment_ids: List[str]
+    assessors: List[str]
+    dimensions: Dict[str, float]
+    dimension_spread: Dict[str, float]
+    adequacy: float
+    potential: float
+    category: str
+    agreement: Optional[float]
+
+    @property
+    def rater_count(self) -> int:
+        return len(self.assessment_ids)
+
+    def to_dict(self) -> Dict:
+        return {
+            "full_name": self.full_name,
+            "position": self.position,
+            "management_level": self.management_level,
+            "assessment_ids": self.assessment_ids,
+            "assessors": self.assessors,
+            "rater_count": self.rater_count,
+            "dimensions": self.dimensions,
+            "dimension_spread": self.dimension_spread,
+            "adequacy": self.adequacy,
+            "potential": self.potential,
+            "category": self.category,
+            "agreement": self.agreement,
+        }
+
+
+@dataclass
+class _Group:
+    members: Dict[str, Assessment] = field(default_factory=dict)
+    sums: List[float] = field(default_factory=lambda: [0.0] * len(ALL_DIMENSIONS))
+    squares: List[float] = field(default_factory=lambda: [0.0] * len(ALL_DIMENSIONS))
+
+    def add(self, assessment: Assessment) -> None:
+        self.members[assessment.id] = assessment
+        self._apply(assessment, 1)
+
+    def remove(self, assessment: Assessment) -> None:
+        del self.members[assessment.id]
+        self._apply(assessment, -1)
+
+    def _apply(self, assessment: Assessment, sign: int) -> None:
+        scores = [assessment.dimensions[dim] for dim in ALL_DIMENSIONS]
+        self.sums = [total + sign * score for total, score in zip(self.sums, scores)]
+        self.squares = [total + sign * score * score for total, score in zip(self.squares, scores)]
+
+    def summarize(self, key: PersonKey) -> ConsolidatedPerson:
+        count = len(self.members)
+        means = [total / count for total in self.sums]
+        spreads = [math.sqrt(max(sq / count - mean * mean, 0.0)) for sq, mean in zip(self.squares, means)]
+        dimensions = dict(zip(ALL_DIMENSIONS, means))
+        scores = calculate_scores(dimensions)  # type: ignore[arg-type]
+        latest = list(self.members.values())[-1]
+        agreement = 1 - sum(spreads) / len(spreads) / _MAX_SPREAD if count > 1 else None
+        return ConsolidatedPerson(
+            key=key,
+            full_name=latest.full_name,
+            position=latest.position,
+            management_level=latest.management_level,
+            assessment_ids=list(self.members),
+            assessors=sorted({a.assessed_by for a in self.members.values()}),
+            dimensions={dim: round(value, 2) for dim, value in dimensions.items()},
+            dimension_spread={dim: round(value, 2) for dim, value in zip(ALL_DIMENSIONS, spreads)},
+            adequacy=scores["adequacy"],  # type: ignore[arg-type]
+            potential=scores["potential"],  # type: ignore[arg-type]
+            category=scores["category"],  # type: ignore[arg-type]
+            agreement=round(agreement, 2) if agreement is not None else None,
+        )
+
+
+class ConsolidationIndex:
+    """Groups assessments of the same person and keeps per-group aggregates up to date.
+
+    Each group holds running per-dimension sums and sums of squares, so adding,
+    removing or changing one assessment only touches its own group. ``sync``
+    diffs a fresh list of assessments against the indexed ones and applies just
+    the changes.
+    """
+
+    def __init__(self):
+        self._groups: Dict[PersonKey, _Group] = {}
+        self._records: Dict[str, Tuple[PersonKey, Assessment]] = {}
+        self._summaries: Dict[PersonKey, ConsolidatedPerson] = {}
+        self._lock = threading.Lock()
+
+    def add(self, assessment: Assessment) -> None:
+        if not is_complete(assessment):
+            raise ValueError(f"Assessment {assessment.id} is missing dimension scores.")
+        with self._lock:
+            self._add(assessment)
+
+    def remove(self, assessment_id: str) -> None:
+        with self._lock:
+            self._remove(assessment_id)
+
+    def sync(self, assessments: List[Assessment]) -> int:
+        """Bring the index in line with ``assessments``; return the number of changed records.
+
+        Records without a valid score for every dimension are left out.
+        """
+        assessments = [a for a in assessments if is_complete(a)]
+        with self._lock:
+            current = {a.id: a for a in assessments}
+            changed = 0
+            for assessment_id in [i for i in self._records if i not in current]:
+                self._remove(assessment_id)
+                changed += 1
+            for assessment in assessments:
+                indexed = self._records.get(assessment.id)
+                if indexed and indexed[1].to_dict() == assessment.to_dict():
+                    continue
+                if indexed:
+                    self._remove(assessment.id)
+                self._add(assessment)
+                changed += 1
+            return changed
+
+    def people(self) -> List[ConsolidatedPerson]:
+        with self._lock:
+            for key in [k for k in self._groups if k not in self._summaries]:
+                self._summaries[key] = self._groups[key].summarize(key)
+            return sorted(self._summaries.values(), key=lambda person: person.key)
+
+    def _add(self, assessment: Assessment) -> None:
+        key = person_key(assessment.full_name, assessment.position)
+        self._groups.setdefault(key, _Group()).add(assessment)
+        self._records[assessment.id] = (key, assessment)
+        self._summaries.pop(key, None)
+
+    def _remove(self, assessment_id: str) -> None:
+        key, assessment = self._records.pop(assessment_id)
+        group = self._groups[key]
+        group.remove(assessment)
+        if not group.members:
+            del self._groups[key]
+        self._summaries.pop(key, None)
+
+
+_INDEX = ConsolidationIndex()
+_INDEXED_VERSION: Optional[Tuple[int, int]] = None
+_SYNC_LOCK = threading.Lock()
+
+
+def get_consolidated_people() -> List[ConsolidatedPerson]:
+    global _INDEXED_VERSION
+    with _SYNC_LOCK:
+        version = storage.assessments_version()
+        up_to_date = version == _INDEXED_VERSION
+        metrics.record_cache("consolidation", up_to_date)
+        if not up_to_date:
+            _INDEX.sync(get_all_assessments())
+            _INDEXED_VERSION = version
+    return _INDEX.people()
+
+
+__all__ = ["ConsolidatedPerson", "ConsolidationIndex", "get_consolidated_people", "is_complete", "person_key"]
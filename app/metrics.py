@@ -0,0 +1,495 @@
+from __future__ import annotations
+
+import bisect
+import cProfile
+import atexit
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from flask import Flask, Response, g, request
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS: Tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def labelsets(self) -> List[LabelValues]:
+        with self._lock:
+            return list(self._values)
+
+    def empty(self) -> "Counter":
+        return Counter(self.name, self.documentation, self.labelnames)
+
+    def dump(self) -> List[Any]:
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def load(self, data: List[Any]) -> None:
+        for labels, value in data:
+            self.inc(tuple(labels), value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose value is either set directly or computed at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._collect = collect
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def empty(self) -> "Gauge":
+        # Gauges describe a single process, so merged output keeps them apart by pid.
+        return Gauge(self.name, self.documentation, self.labelnames + ("pid",))
+
+    def dump(self) -> List[Any]:
+        with self._lock:
+            return [[list(labels), value] for labels, value in self._values.items()]
+
+    def load(self, data: List[Any], extra_labels: LabelValues = ()) -> None:
+        for labels, value in data:
+            self.set(value, tuple(labels) + extra_labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            values = dict(self._values)
+        if self._collect is not None:
+            values.update(self._collect())
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def empty(self) -> "Histogram":
+        return Histogram(self.name, self.documentation, self.labelnames, self.buckets)
+
+    def dump(self) -> List[Any]:
+        with self._lock:
+            return [[list(labels), list(counts), total[0]] for labels, (counts, total) in self._series.items()]
+
+    def load(self, data: List[Any]) -> None:
+        with self._lock:
+            for labels, counts, total in data:
+                series = self._series.setdefault(tuple(labels), ([0] * (len(self.buckets) + 1), [0.0]))
+                series[0][:] = [current + added for current, added in zip(series[0], counts)]
+                series[1][0] += total
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests by route.",
+    ("method", "route"),
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code.",
+    ("method", "route", "status"),
+)
+STORAGE_READS = Counter("storage_reads_total", "Storage file reads.", ("file",))
+STORAGE_READ_BYTES = Counter("storage_read_bytes_total", "Bytes read from storage files.", ("file",))
+STORAGE_WRITES = Counter("storage_writes_total", "Storage file writes.", ("file",))
+STORAGE_WRITE_BYTES = Counter("storage_write_bytes_total", "Bytes written to storage files.", ("file",))
+STORAGE_PARSE_SECONDS = Histogram(
+    "storage_parse_seconds",
+    "Time spent parsing JSON read from storage files.",
+    ("file",),
+    buckets=FAST_BUCKETS,
+)
+INSIGHT_LATENCY = Histogram(
+    "insight_request_duration_seconds",
+    "Latency of InsightService calls by outcome.",
+    ("outcome",),
+)
+INSIGHT_REQUESTS = Counter(
+    "insight_requests_total",
+    "InsightService calls by outcome (success, failure, disabled).",
+    ("outcome",),
+)
+CACHE_HITS = Counter("cache_hits_total", "Cache hits by cache name.", ("cache",))
+CACHE_MISSES = Counter("cache_misses_total", "Cache misses by cache name.", ("cache",))
+STARTUP_SECONDS = Gauge("app_startup_seconds", "Time spent in create_app() for this process.")
+FIRST_REQUEST_SECONDS = Gauge(
+    "app_first_request_seconds",
+    "Latency of the first request served by this worker process.",
+)
+
+
+def _cache_hit_ratios(hits_counter: Counter, misses_counter: Counter) -> Dict[LabelValues, float]:
+    names = set(hits_counter.labelsets()) | set(misses_counter.labelsets())
+    ratios: Dict[LabelValues, float] = {}
+    for labels in names:
+        hits = hits_counter.value(labels)
+        total = hits + misses_counter.value(labels)
+        ratios[labels] = hits / total if total else 0.0
+    return ratios
+
+
+def _cache_hit_ratio_gauge(hits_counter: Counter, misses_counter: Counter) -> Gauge:
+    return Gauge(
+        "cache_hit_ratio",
+        "Ratio of hits to lookups by cache name.",
+        ("cache",),
+        collect=lambda: _cache_hit_ratios(hits_counter, misses_counter),
+    )
+
+
+CACHE_HIT_RATIO = _cache_hit_ratio_gauge(CACHE_HITS, CACHE_MISSES)
+
+Metric = Union[Counter, Gauge, Histogram]
+
+# Metrics whose values are recorded (and, in multiprocess mode, shared through files).
+COLLECTED: List[Metric] = [
+    REQUEST_LATENCY,
+    REQUESTS,
+    STORAGE_READS,
+    STORAGE_READ_BYTES,
+    STORAGE_WRITES,
+    STORAGE_WRITE_BYTES,
+    STORAGE_PARSE_SECONDS,
+    INSIGHT_LATENCY,
+    INSIGHT_REQUESTS,
+    CACHE_HITS,
+    CACHE_MISSES,
+    STARTUP_SECONDS,
+    FIRST_REQUEST_SECONDS,
+]
+
+REGISTRY: List[Metric] = [
+    REQUEST_LATENCY,
+    REQUESTS,
+    STORAGE_READS,
+    STORAGE_READ_BYTES,
+    STORAGE_WRITES,
+    STORAGE_WRITE_BYTES,
+    STORAGE_PARSE_SECONDS,
+    INSIGHT_LATENCY,
+    INSIGHT_REQUESTS,
+    CACHE_HITS,
+    CACHE_MISSES,
+    CACHE_HIT_RATIO,
+    STARTUP_SECONDS,
+    FIRST_REQUEST_SECONDS,
+]
+
+_first_request_pid: Optional[int] = None
+
+# Multiprocess mode: every process periodically writes its own values to a file
+# in this directory and /metrics merges all files, so any worker answering a
+# scrape reports totals for the whole server.
+_MULTIPROCESS_DIR = os.environ.get("LEADERSHIP_APP_METRICS_DIR")
+_FLUSH_SECONDS = float(os.environ.get("LEADERSHIP_APP_METRICS_FLUSH_SECONDS", "1") or 1)
+_flusher_pid: Optional[int] = None
+_flusher_lock = threading.Lock()
+
+
+def _process_file(directory: Path, pid: int) -> Path:
+    return directory / f"metrics-{pid}.json"
+
+
+def flush() -> None:
+    """Write this process's values to the multiprocess directory (no-op when not configured)."""
+    if not _MULTIPROCESS_DIR:
+        return
+    directory = Path(_MULTIPROCESS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+    payload = json.dumps({"pid": pid, "metrics": {metric.name: metric.dump() for metric in COLLECTED}})
+    target = _process_file(directory, pid)
+    temporary = target.with_suffix(".tmp")
+    temporary.write_text(payload, encoding="utf-8")
+    os.replace(temporary, target)
+
+
+def _flush_periodically() -> None:
+    while True:
+        time.sleep(_FLUSH_SECONDS)
+        try:
+            flush()
+        except OSError:  # pragma: no cover - keep the worker alive if the directory is unavailable
+            pass
+
+
+def _ensure_flusher() -> None:
+    # Started from the request path only, i.e. in serving workers after any fork.
+    global _flusher_pid
+    if not _MULTIPROCESS_DIR or _flusher_pid == os.getpid():
+        return
+    with _flusher_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+        threading.Thread(target=_flush_periodically, name="metrics-flush", daemon=True).start()
+        atexit.register(flush)
+
+
+def _reset_after_fork() -> None:
+    global _flusher_pid
+    # The parent's values are already in its own file; start the child from zero
+    # so they are not counted once per worker.
+    _flusher_pid = None
+    for metric in COLLECTED:
+        metric.reset()
+
+
+if _MULTIPROCESS_DIR:
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _render_multiprocess(directory: Path) -> List[Metric]:
+    flush()
+    merged: Dict[str, Metric] = {metric.name: metric.empty() for metric in COLLECTED}
+    for path in sorted(directory.glob("metrics-*.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        pid = int(data.get("pid", 0))
+        alive = _pid_alive(pid)
+        for name, series in data.get("metrics", {}).items():
+            metric = merged.get(name)
+            if isinstance(metric, Gauge):
+                # Counters and histograms of exited workers still count; their gauges do not.
+                if alive:
+                    metric.load(series, (str(pid),))
+            elif metric is not None:
+                metric.load(series)
+    hits = merged[CACHE_HITS.name]
+    misses = merged[CACHE_MISSES.name]
+    ratio = _cache_hit_ratio_gauge(hits, misses)  # type: ignore[arg-type]
+    return [merged[metric.name] if metric is not CACHE_HIT_RATIO else ratio for metric in REGISTRY]
+
+
+def record_request(method: str, route: str, status: int, seconds: float) -> None:
+    global _first_request_pid
+    if _first_request_pid != os.getpid():
+        # Tracked per process so forked workers report their own first request.
+        _first_request_pid = os.getpid()
+        FIRST_REQUEST_SECONDS.set(seconds)
+        _ensure_flusher()
+    REQUEST_LATENCY.observe(seconds, (method, route))
+    REQUESTS.inc((method, route, str(status)))
+
+
+def record_startup(seconds: float) -> None:
+    STARTUP_SECONDS.set(seconds)
+    # Persist startup work (e.g. preloading in a parent that forks workers) right away.
+    flush()
+
+
+def record_storage_read(file: str, size: int, parse_seconds: float) -> None:
+    STORAGE_READS.inc((file,))
+    STORAGE_READ_BYTES.inc((file,), size)
+    STORAGE_PARSE_SECONDS.observe(parse_seconds, (file,))
+
+
+def record_storage_write(file: str, size: int) -> None:
+    STORAGE_WRITES.inc((file,))
+    STORAGE_WRITE_BYTES.inc((file,), size)
+
+
+def record_insight(outcome: str, seconds: float) -> None:
+    INSIGHT_LATENCY.observe(seconds, (outcome,))
+    INSIGHT_REQUESTS.inc((outcome,))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    (CACHE_HITS if hit else CACHE_MISSES).inc((cache,))
+
+
+def render_latest() -> str:
+    metrics = _render_multiprocess(Path(_MULTIPROCESS_DIR)) if _MULTIPROCESS_DIR else REGISTRY
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _profile_settings() -> Tuple[float, float]:
+    sample_rate = float(os.environ.get("LEADERSHIP_APP_PROFILE_SAMPLE_RATE", "0") or 0)
+    slow_ms = float(os.environ.get("LEADERSHIP_APP_PROFILE_SLOW_MS", "500") or 500)
+    return sample_rate, slow_ms / 1000.0
+
+
+def configure_metrics(app: Flask) -> None:
+    sample_rate, slow_threshold = _profile_settings()
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+        if sample_rate > 0 and random.random() < sample_rate:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is already active in this thread
+                return
+            g.metrics_profiler = profiler
+
+    @app.after_request
+    def _capture_status(response: Response) -> Response:
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _record(_exc: Optional[BaseException]) -> None:
+        started = g.pop("metrics_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+        record_request(request.method, route, g.pop("metrics_status", 500), elapsed)
+        profiler: Optional[cProfile.Profile] = g.pop("metrics_profiler", None)
+        if profiler is None:
+            return
+        profiler.disable()
+        if elapsed >= slow_threshold:
+            output = io.StringIO()
+            pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(25)
+            app.logger.warning(
+                "Slow request %s %s took %.1f ms\n%s", request.method, route, elapsed * 1000, output.getvalue()
+            )
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(render_latest(), content_type=CONTENT_TYPE)
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "configure_metrics",
+    "flush",
+    "record_cache",
+    "record_insight",
+    "record_request",
+    "record_storage_read",
+    "record_startup",
+    "record_storage_write",
+    "render_latest",
+]
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import importlib.util
+import math
+import os
+import re
+import struct
+import time
+import unicodedata
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Deque, Dict, Iterable, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from .domain import ALL_DIMENSIONS, DIMENSION_DETAILS
+from .services import Assessment, get_insight_service
+
+_TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+_RADAR_SIZE = 360
+_RADAR_RADIUS = 130
+_MAX_SCORE = 5
+
+
+def select_assessments(
+    assessments: Iterable[Assessment],
+    category: Optional[str] = None,
+    management_level: Optional[str] = None,
+    assessed_by: Optional[str] = None,
+) -> List[Assessment]:
+    selected = []
+    for assessment in assessments:
+        if category and assessment.category != category:
+            continue
+        if management_level and assessment.management_level != management_level:
+            continue
+        if assessed_by and assessment.assessed_by.lower() != assessed_by.lower():
+            continue
+        selected.append(assessment)
+    return selected
+
+
+def _point(index: int, value: float) -> Tuple[float, float]:
+    angle = -math.pi / 2 + 2 * math.pi * index / len(ALL_DIMENSIONS)
+    distance = _RADAR_RADIUS * value / _MAX_SCORE
+    center = _RADAR_SIZE / 2
+    return round(center + distance * math.cos(angle), 1), round(center + distance * math.sin(angle), 1)
+
+
+def _points(values: List[float]) -> str:
+    return " ".join(f"{x},{y}" for x, y in (_point(i, v) for i, v in enumerate(values)))
+
+
+@lru_cache(maxsize=1)
+def _radar_grid() -> Dict:
+    labels = []
+    for index, key in enumerate(ALL_DIMENSIONS):
+        x, y = _point(index, _MAX_SCORE + 0.8)
+        anchor = "middle" if abs(x - _RADAR_SIZE / 2) < 1 else ("start" if x > _RADAR_SIZE / 2 else "end")
+        labels.append({"x": x, "y": y, "text": key, "anchor": anchor})
+    return {
+        "size": _RADAR_SIZE,
+        "center": _RADAR_SIZE / 2,
+        "rings": [_points([level] * len(ALL_DIMENSIONS)) for level in range(1, _MAX_SCORE + 1)],
+        "axes": [dict(zip(("x", "y"), _point(i, _MAX_SCORE))) for i in range(len(ALL_DIMENSIONS))],
+        "labels": labels,
+    }
+
+
+def radar_data(dimensions: Dict[str, int]) -> Dict:
+    return {**_radar_grid(), "polygon": _points([dimensions.get(key, 0) for key in ALL_DIMENSIONS])}
+
+
+@lru_cache(maxsize=1)
+def _environment() -> Environment:
+    return Environment(loader=FileSystemLoader(_TEMPLATES_DIR), autoescape=select_autoescape(["html"]))
+
+
+def render_report_html(assessment: Assessment, insight: Optional[str] = None) -> str:
+    return _environment().get_template("report.html").render(
+        assessment=assessment,
+        dimensions=DIMENSION_DETAILS,
+        radar=radar_data(assessment.dimensions),
+        insight=insight,
+    )
+
+
+def pdf_support_available() -> bool:
+    return importlib.util.find_spec("weasyprint") is not None
+
+
+def render_report_pdf(html: str) -> bytes:
+    try:
+        from weasyprint import HTML  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("PDF reports require the optional 'weasyprint' package.") from exc
+    return HTML(string=html).write_pdf()
+
+
+def report_basename(assessment: Assessment) -> str:
+    ascii_name = unicodedata.normalize("NFKD", assessment.full_name).encode("ascii", "ignore").decode("ascii")
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_name.lower()).strip("-") or "procjena"
+    return f"{slug}-{assessment.id}"
+
+
+# (archive name, CRC-32, uncompressed size, raw DEFLATE data)
+_Entry = Tuple[str, int, int, bytes]
+
+_CHUNK_SIZE = 64
+# "Version made by": ZIP 2.0 on a Unix host, so the external attributes carry file modes.
+_VERSION_MADE_BY = (3 << 8) | 20
+
+
+def _deflate(name: str, content: bytes) -> _Entry:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    data = compressor.compress(content) + compressor.flush()
+    return name, zlib.crc32(content), len(content), data
+
+
+def _render_chunk(jobs: List[Tuple[Assessment, Optional[str]]], pdf: bool) -> List[_Entry]:
+    entries = []
+    for assessment, insight in jobs:
+        basename = report_basename(assessment)
+        html = render_report_html(assessment, insight)
+        entries.append(_deflate(f"{basename}.html", html.encode("utf-8")))
+        if pdf:
+            entries.append(_deflate(f"{basename}.pdf", render_report_pdf(html)))
+    return entries
+
+
+class _ZipStreamWriter:
+    """Minimal ZIP writer for entries that are already DEFLATE-compressed.
+
+    Compression happens in the worker processes, so the parent only copies
+    bytes. Offsets are tracked locally, so ``fileobj`` may be non-seekable.
+    Archives are limited to the classic (non-ZIP64) format: 65535 entries, 4 GiB.
+    """
+
+    def __init__(self, fileobj: BinaryIO):
+        self.fileobj = fileobj
+        self.offset = 0
+        self.central_directory: List[bytes] = []
+        now = time.localtime()
+        self.dos_time = (now.tm_hour << 11) | (now.tm_min << 5) | (now.tm_sec // 2)
+        self.dos_date = ((now.tm_year - 1980) << 9) | (now.tm_mon << 5) | now.tm_mday
+
+    def _write(self, data: bytes) -> None:
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def add(self, entry: _Entry) -> None:
+        name, crc, size, data = entry
+        encoded = name.encode("utf-8")
+        if len(self.central_directory) >= 0xFFFF or self.offset + len(data) >= 0xFFFFFFFF:
+            raise RuntimeError("Report archive exceeds the ZIP size limits; narrow the selection.")
+        fields = (0x0800, zipfile.ZIP_DEFLATED, self.dos_time, self.dos_date, crc, len(data), size, len(encoded))
+        header = struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, _VERSION_MADE_BY, 20, *fields, 0, 0, 0, 0, 0o644 << 16, self.offset
+        )
+        self.central_directory.append(header + encoded)
+        self._write(struct.pack("<IHHHHHIIIHH", 0x04034B50, 20, *fields, 0) + encoded)
+        self._write(data)
+
+    def close(self) -> None:
+        start = self.offset
+        for record in self.central_directory:
+            self._write(record)
+        count = len(self.central_directory)
+        self._write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, self.offset - start, start, 0))
+
+
+def write_reports_zip(
+    assessments: List[Assessment],
+    fileobj: BinaryIO,
+    pdf: bool = False,
+    workers: Optional[int] = None,
+) -> int:
+    """Render one report per assessment across a process pool into a ZIP archive.
+
+    Workers render and compress chunks of assessments, so the parent only
+    writes bytes. At most two chunks per worker are in flight and finished
+    chunks go straight to the archive, so memory stays bounded regardless of
+    population size. ``fileobj`` may be non-seekable (e.g. stdout).
+    """
+    workers = workers or os.cpu_count() or 1
+    insights = get_insight_service().cached_insights(assessments)
+    jobs = [(a, insights.get(a.id)) for a in assessments]
+    chunks = [jobs[i:i + _CHUNK_SIZE] for i in range(0, len(jobs), _CHUNK_SIZE)]
+    archive = _ZipStreamWriter(fileobj)
+    if workers == 1:
+        for chunk in chunks:
+            for entry in _render_chunk(chunk, pdf):
+                archive.add(entry)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending: Deque[Future] = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_render_chunk, chunk, pdf))
+                if len(pending) >= workers * 2:
+                    for entry in pending.popleft().result():
+                        archive.add(entry)
+            while pending:
+                for entry in pending.popleft().result():
+                    archive.add(entry)
+    archive.close()
+    return len(assessments)
+
+
+__all__ = [
+    "pdf_support_available",
+    "radar_data",
+    "render_report_html",
+    "render_report_pdf",
+    "report_basename",
+    "select_assessments",
+    "write_reports_zip",
+]
@@ -14,31 +14,31 @@ from flask import (
     url_for,
 )
 
+from .consolidation import get_consolidated_people
 from .domain import ALL_DIMENSIONS, DIMENSION_DETAILS, MANAGEMENT_LEVELS, summarize_by_category
 from .services import (
     Assessment,
+    AssessmentForbidden,
+    AssessmentNotFound,
     InsightService,
     User,
+    can_view_assessment,
     create_assessment,
     delete_assessment,
-    ensure_seed_users,
     find_assessment,
     get_all_assessments,
     get_insight_service,
+    get_visible_assessment,
     update_assessment,
+    user_from_session,
     verify_user,
+    visible_assessments,
 )
 
 
 def configure_routes(app: Flask) -> None:
-    ensure_seed_users()
-
     def current_user() -> Optional[User]:
-        email = session.get("user_email")
-        role = session.get("user_role")
-        if not email or not role:
-            return None
-        return User(id="", email=email, password_hash="", role=role)
+        return user_from_session(session)
 
     def login_required(view):
         @wraps(view)
@@ -74,9 +74,7 @@ def configure_routes(app: Flask) -> None:
     def dashboard():
         user = current_user()
         assert user is not None
-        assessments = get_all_assessments()
-        if not user.is_master:
-            assessments = [a for a in assessments if a.assessed_by == user.email]
+        assessments = visible_assessments(user, get_all_assessments())
         summary = summarize_by_category([a.to_dict() for a in assessments])
         return render_template(
             "dashboard.html",
@@ -134,7 +132,7 @@ def configure_routes(app: Flask) -> None:
         if not assessment:
             flash("Procjena nije pronađena.", "danger")
             return redirect(url_for("dashboard"))
-        if assessment.assessed_by != user.email and not user.is_master:
+        if not can_view_assessment(user, assessment):
             flash("Nemate ovlasti za uređivanje ove procjene.", "danger")
             return redirect(url_for("dashboard"))
         if request.method == "POST":
@@ -172,19 +170,17 @@ def configure_routes(app: Flask) -> None:
         selected_id = request.args.get("selected")
         comparison_a = request.args.get("a")
         comparison_b = request.args.get("b")
-        all_assessments = get_all_assessments()
-        if not user.is_master:
-            all_assessments = [a for a in all_assessments if a.assessed_by == user.email]
+        all_assessments = visible_assessments(user, get_all_assessments())
         selected_assessment = (
             find_assessment(selected_id) if selected_id else (all_assessments[0] if all_assessments else None)
         )
-        if selected_assessment and not user.is_master and selected_assessment.assessed_by != user.email:
+        if selected_assessment and not can_view_assessment(user, selected_assessment):
             selected_assessment = None
         comparison_first = find_assessment(comparison_a) if comparison_a else None
         comparison_second = find_assessment(comparison_b) if comparison_b else None
-        if comparison_first and not (user.is_master or comparison_first.assessed_by == user.email):
+        if comparison_first and not can_view_assessment(user, comparison_first):
             comparison_first = None
-        if comparison_second and not (user.is_master or comparison_second.assessed_by == user.email):
+        if comparison_second and not can_view_assessment(user, comparison_second):
             comparison_second = None
         return render_template(
             "visualizations.html",
@@ -197,14 +193,27 @@ def configure_routes(app: Flask) -> None:
             dimensions=DIMENSION_DETAILS,
         )
 
+    @app.route("/consolidated")
+    @login_required
+    def consolidated():
+        user = current_user()
+        assert user is not None
+        if not user.is_master:
+            flash("Nemate ovlasti za pregled objedinjenih procjena.", "danger")
+            return redirect(url_for("dashboard"))
+        return render_template(
+            "consolidated.html",
+            user=user,
+            people=get_consolidated_people(),
+            dimensions=DIMENSION_DETAILS,
+        )
+
     @app.route("/api/assessments")
     @login_required
     def api_assessments():
         user = current_user()
         assert user is not None
-        assessments = get_all_assessments()
-        if not user.is_master:
-            assessments = [a for a in assessments if a.assessed_by == user.email]
+        assessments = visible_assessments(user, get_all_assessments())
         return jsonify([a.to_dict() for a in assessments])
 
     @app.route("/api/assessments/<assessment_id>")
@@ -212,10 +221,11 @@ def configure_routes(app: Flask) -> None:
     def api_assessment_detail(assessment_id: str):
         user = current_user()
         assert user is not None
-        assessment = find_assessment(assessment_id)
-        if not assessment:
+        try:
+            assessment = get_visible_assessment(assessment_id, user)
+        except AssessmentNotFound:
             return jsonify({"error": "Not found"}), 404
-        if not user.is_master and assessment.assessed_by != user.email:
+        except AssessmentForbidden:
             return jsonify({"error": "Forbidden"}), 403
         return jsonify(assessment.to_dict())
 
@@ -224,14 +234,24 @@ def configure_routes(app: Flask) -> None:
     def api_insights(assessment_id: str):
         user = current_user()
         assert user is not None
-        assessment = find_assessment(assessment_id)
-        if not assessment:
+        try:
+            assessment = get_visible_assessment(assessment_id, user)
+        except AssessmentNotFound:
             return jsonify({"error": "Not found"}), 404
-        if not user.is_master and assessment.assessed_by != user.email:
+        except AssessmentForbidden:
             return jsonify({"error": "Forbidden"}), 403
         insight_service: InsightService = get_insight_service()
         content = insight_service.generate_insight(assessment)
         return jsonify({"content": content})
 
+    @app.route("/api/consolidated")
+    @login_required
+    def api_consolidated():
+        user = current_user()
+        assert user is not None
+        if not user.is_master:
+            return jsonify({"error": "Forbidden"}), 403
+        return jsonify([person.to_dict() for person in get_consolidated_people()])
+
 
 __all__ = ["configure_routes"]
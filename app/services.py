@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
+import time
 import uuid
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 
 from werkzeug.security import check_password_hash, generate_password_hash
 
-from . import storage
+from . import metrics, storage
 from .domain import ALL_DIMENSIONS, DIMENSION_DETAILS, calculate_scores
 
 
@@ -72,15 +75,16 @@ def create_user(email: str, password: str, role: str = "standard") -> User:
     return user
 
 
-def ensure_seed_users() -> None:
+def ensure_seed_users() -> bool:
     users = get_all_users()
     if users:
-        return
+        return False
     default_password = os.environ.get("LEADERSHIP_APP_DEFAULT_PASSWORD", "ChangeMe123!")
     master_email = os.environ.get("LEADERSHIP_APP_MASTER_EMAIL", "master@example.com")
     standard_email = os.environ.get("LEADERSHIP_APP_STANDARD_EMAIL", "user@example.com")
     create_user(master_email, default_password, role="master")
     create_user(standard_email, default_password, role="standard")
+    return True
 
 
 @dataclass
@@ -159,7 +163,7 @@ def update_assessment(assessment_id: str, data: Dict, user: User) -> Optional[As
     assessments = get_all_assessments()
     for idx, assessment in enumerate(assessments):
         if assessment.id == assessment_id:
-            if assessment.assessed_by != user.email and not user.is_master:
+            if not can_view_assessment(user, assessment):
                 return None
             dimensions = {dim: int(data.get(dim, 1)) for dim in ALL_DIMENSIONS}
             scores = calculate_scores(dimensions)
@@ -182,7 +186,7 @@ def delete_assessment(assessment_id: str, user: User) -> bool:
     removed = False
     for assessment in assessments:
         if assessment.id == assessment_id:
-            if assessment.assessed_by != user.email and not user.is_master:
+            if not can_view_assessment(user, assessment):
                 return False
             removed = True
             continue
@@ -199,26 +203,154 @@ def find_assessment(assessment_id: str) -> Optional[Assessment]:
     return None
 
 
+class AssessmentNotFound(LookupError):
+    pass
+
+
+class AssessmentForbidden(PermissionError):
+    pass
+
+
+def user_from_session(session: Mapping) -> Optional[User]:
+    email = session.get("user_email")
+    role = session.get("user_role")
+    if not email or not role:
+        return None
+    return User(id="", email=email, password_hash="", role=role)
+
+
+def can_view_assessment(user: User, assessment: Assessment) -> bool:
+    return user.is_master or assessment.assessed_by == user.email
+
+
+def visible_assessments(user: User, assessments: List[Assessment]) -> List[Assessment]:
+    if user.is_master:
+        return assessments
+    return [a for a in assessments if can_view_assessment(user, a)]
+
+
+def _check_visible(user: User, assessment: Optional[Assessment]) -> Assessment:
+    if not assessment:
+        raise AssessmentNotFound()
+    if not can_view_assessment(user, assessment):
+        raise AssessmentForbidden()
+    return assessment
+
+
+def get_visible_assessment(assessment_id: str, user: User) -> Assessment:
+    return _check_visible(user, find_assessment(assessment_id))
+
+
+async def get_visible_assessment_async(assessment_id: str, user: User) -> Assessment:
+    return _check_visible(user, await find_assessment_async(assessment_id))
+
+
+async def get_all_assessments_async() -> List[Assessment]:
+    return [_deserialize_assessment(a) for a in await storage.load_assessments_async()]
+
+
+async def find_assessment_async(assessment_id: str) -> Optional[Assessment]:
+    for assessment in await get_all_assessments_async():
+        if assessment.id == assessment_id:
+            return assessment
+    return None
+
+
+def _find_cached_insight(insights: List[Dict], assessment_id: str, fingerprint: str) -> Optional[str]:
+    for item in insights:
+        if item.get("assessment_id") == assessment_id and item.get("fingerprint") == fingerprint:
+            return item.get("content")
+    return None
+
+
 class InsightService:
     def __init__(self):
         self.api_key = os.environ.get("GOOGLE_GEMINI_API_KEY")
+        self.model_name = os.environ.get("GOOGLE_GEMINI_MODEL", "models/gemini-1.5-flash")
 
     def generate_insight(self, assessment: Assessment) -> str:
+        started = time.perf_counter()
+        prompt = self._build_prompt(assessment)
+        fingerprint = self._fingerprint(prompt)
+        cached = self._cache_lookup(storage.load_insights(), assessment.id, fingerprint)
+        if cached is not None:
+            return cached
         if not self.api_key:
-            return (
-                "AI uvid nije generiran jer Google Gemini API ključ nije konfiguriran. "
-                "Postavite varijablu okoline GOOGLE_GEMINI_API_KEY kako biste omogućili ovu značajku."
-            )
+            return self._disabled(started)
         try:
-            import google.generativeai as genai  # type: ignore
-
-            genai.configure(api_key=self.api_key)
-            prompt = self._build_prompt(assessment)
-            model_name = os.environ.get("GOOGLE_GEMINI_MODEL", "models/gemini-1.5-flash")
-            response = genai.GenerativeModel(model_name).generate_content(prompt)
-            return response.text or "Nije moguće generirati uvid u ovom trenutku."
+            response = self._model().generate_content(prompt)
+            content = self._success(response, started)
+        except Exception as exc:  # pragma: no cover - integration fallback
+            return self._failure(exc, started)
+        if not content:
+            return "Nije moguće generirati uvid u ovom trenutku."
+        storage.upsert_insight({"assessment_id": assessment.id, "fingerprint": fingerprint, "content": content})
+        return content
+
+    async def generate_insight_async(self, assessment: Assessment) -> str:
+        started = time.perf_counter()
+        prompt = self._build_prompt(assessment)
+        fingerprint = self._fingerprint(prompt)
+        cached = self._cache_lookup(await storage.load_insights_async(), assessment.id, fingerprint)
+        if cached is not None:
+            return cached
+        if not self.api_key:
+            return self._disabled(started)
+        try:
+            # Importing and configuring the SDK is slow on first use, so keep it off the event loop.
+            model = await asyncio.to_thread(self._model)
+            response = await model.generate_content_async(prompt)
+            content = self._success(response, started)
         except Exception as exc:  # pragma: no cover - integration fallback
-            return f"Generiranje AI uvida nije uspjelo: {exc}"
+            return self._failure(exc, started)
+        if not content:
+            return "Nije moguće generirati uvid u ovom trenutku."
+        insight = {"assessment_id": assessment.id, "fingerprint": fingerprint, "content": content}
+        await storage.upsert_insight_async(insight)
+        return content
+
+    def cached_insights(self, assessments: List[Assessment]) -> Dict[str, str]:
+        """Return previously generated insights that still match the current assessment data.
+
+        Meant for batch export, so lookups are not counted in the request-path cache metrics.
+        """
+        by_id = {item.get("assessment_id"): item for item in storage.load_insights()}
+        result: Dict[str, str] = {}
+        for assessment in assessments:
+            item = by_id.get(assessment.id)
+            if item and item.get("fingerprint") == self._fingerprint(self._build_prompt(assessment)):
+                result[assessment.id] = item.get("content", "")
+        return result
+
+    def _fingerprint(self, prompt: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def _cache_lookup(self, insights: List[Dict], assessment_id: str, fingerprint: str) -> Optional[str]:
+        cached = _find_cached_insight(insights, assessment_id, fingerprint)
+        metrics.record_cache("insights", cached is not None)
+        return cached
+
+    def _model(self):
+        import google.generativeai as genai  # type: ignore
+
+        genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(self.model_name)
+
+    def _disabled(self, started: float) -> str:
+        metrics.record_insight("disabled", time.perf_counter() - started)
+        return (
+            "AI uvid nije generiran jer Google Gemini API ključ nije konfiguriran. "
+            "Postavite varijablu okoline GOOGLE_GEMINI_API_KEY kako biste omogućili ovu značajku."
+        )
+
+    def _success(self, response, started: float) -> str:
+        text = response.text
+        metrics.record_insight("success", time.perf_counter() - started)
+        return text or ""
+
+    def _failure(self, exc: Exception, started: float) -> str:
+        metrics.record_insight("failure", time.perf_counter() - started)
+        return f"Generiranje AI uvida nije uspjelo: {exc}"
 
     def _build_prompt(self, assessment: Assessment) -> str:
         lines = [
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import gc
+import importlib
+import os
+import sys
+import threading
+from typing import Optional
+
+from flask import Flask
+
+from . import storage
+
+# Imported lazily by request handlers; loading them up front keeps that cost off the first request.
+OPTIONAL_MODULES = ["google.generativeai"]
+
+
+def _import_optional_modules() -> None:
+    for name in OPTIONAL_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:  # pragma: no cover - optional dependency
+            pass
+
+
+def preload_enabled() -> bool:
+    return os.environ.get("LEADERSHIP_APP_PRELOAD", "").lower() in ("1", "true", "yes")
+
+
+def preload(app: Flask) -> None:
+    """Do per-process startup work once, before workers are forked.
+
+    Parses the data files into the storage snapshot, compiles templates and
+    imports optional dependencies, then freezes the resulting objects so forked
+    workers share them copy-on-write instead of repeating the work.
+    """
+    storage.preload()
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+    if os.environ.get("GOOGLE_GEMINI_API_KEY"):
+        _import_optional_modules()
+    gc.freeze()
+
+
+_warmed_up_pid: Optional[int] = None
+_warm_up_lock = threading.Lock()
+
+
+def warm_up_once() -> None:
+    """Import optional dependencies in a background thread, once per process.
+
+    Called from the request path, so it always runs in a serving worker after
+    any fork; a thread started before a fork could leave the child blocked on
+    an import lock held by a thread that no longer exists.
+    """
+    global _warmed_up_pid
+    if _warmed_up_pid == os.getpid():
+        return
+    with _warm_up_lock:
+        if _warmed_up_pid == os.getpid():
+            return
+        _warmed_up_pid = os.getpid()
+    if not os.environ.get("GOOGLE_GEMINI_API_KEY"):
+        return
+    if all(name in sys.modules for name in OPTIONAL_MODULES):
+        return
+    threading.Thread(target=_import_optional_modules, name="warm-up", daemon=True).start()
+
+
+def configure_warm_up(app: Flask) -> None:
+    @app.before_request
+    def _warm_up():
+        warm_up_once()
+
+
+__all__ = ["configure_warm_up", "preload", "preload_enabled", "warm_up_once"]
@@ -1,13 +1,20 @@
+import asyncio
 import json
 import threading
+import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Tuple
+
+from . import metrics
 
 
 _DATA_DIR = Path(__file__).resolve().parent / "data"
 _ASSESSMENTS_FILE = _DATA_DIR / "assessments.json"
 _USERS_FILE = _DATA_DIR / "users.json"
+_INSIGHTS_FILE = _DATA_DIR / "insights.json"
 _LOCK = threading.Lock()
+# Parsed file contents keyed by path, tagged with the (mtime, size) they were read at.
+_SNAPSHOT: Dict[Path, Tuple[Tuple[int, int], List[Dict]]] = {}
 
 
 def _ensure_data_files() -> None:
@@ -16,29 +23,108 @@ def _ensure_data_files() -> None:
         _ASSESSMENTS_FILE.write_text(json.dumps({"assessments": []}, indent=2), encoding="utf-8")
     if not _USERS_FILE.exists():
         _USERS_FILE.write_text(json.dumps({"users": []}, indent=2), encoding="utf-8")
+    if not _INSIGHTS_FILE.exists():
+        _INSIGHTS_FILE.write_text(json.dumps({"insights": []}, indent=2), encoding="utf-8")
 
 
-def load_assessments() -> List[Dict]:
+def _version(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _copy(value: Any) -> Any:
+    """Deep copy of parsed JSON, so callers never share objects with ``_SNAPSHOT``."""
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def _read_items(path: Path, key: str) -> List[Dict]:
+    _ensure_data_files()
+    version = _version(path)
+    cached = _SNAPSHOT.get(path)
+    metrics.record_cache("storage", cached is not None and cached[0] == version)
+    if cached is not None and cached[0] == version:
+        return _copy(cached[1])
+    raw = path.read_bytes()
+    started = time.perf_counter()
+    items = json.loads(raw).get(key, [])
+    metrics.record_storage_read(path.name, len(raw), time.perf_counter() - started)
+    _SNAPSHOT[path] = (version, _copy(items))
+    return items
+
+
+def _write_items(path: Path, key: str, items: List[Dict]) -> None:
+    with _LOCK:
+        _write_items_locked(path, key, items)
+
+
+def _write_items_locked(path: Path, key: str, items: List[Dict]) -> None:
     _ensure_data_files()
-    with _ASSESSMENTS_FILE.open("r", encoding="utf-8") as f:
-        return json.load(f).get("assessments", [])
+    payload = json.dumps({key: items}, indent=2, ensure_ascii=False).encode("utf-8")
+    path.write_bytes(payload)
+    _SNAPSHOT.pop(path, None)
+    metrics.record_storage_write(path.name, len(payload))
+
+
+def preload() -> None:
+    """Parse all data files into the in-memory snapshot ahead of the first request."""
+    load_assessments()
+    load_users()
+    load_insights()
+
+
+def load_assessments() -> List[Dict]:
+    return _read_items(_ASSESSMENTS_FILE, "assessments")
 
 
 def save_assessments(assessments: List[Dict]) -> None:
+    _write_items(_ASSESSMENTS_FILE, "assessments", assessments)
+
+
+def assessments_version() -> Tuple[int, int]:
+    """Cheap change marker for the assessments file (modification time and size)."""
     _ensure_data_files()
-    with _LOCK:
-        with _ASSESSMENTS_FILE.open("w", encoding="utf-8") as f:
-            json.dump({"assessments": assessments}, f, indent=2, ensure_ascii=False)
+    return _version(_ASSESSMENTS_FILE)
 
 
 def load_users() -> List[Dict]:
-    _ensure_data_files()
-    with _USERS_FILE.open("r", encoding="utf-8") as f:
-        return json.load(f).get("users", [])
+    return _read_items(_USERS_FILE, "users")
 
 
 def save_users(users: List[Dict]) -> None:
-    _ensure_data_files()
+    _write_items(_USERS_FILE, "users", users)
+
+
+def load_insights() -> List[Dict]:
+    return _read_items(_INSIGHTS_FILE, "insights")
+
+
+def save_insights(insights: List[Dict]) -> None:
+    _write_items(_INSIGHTS_FILE, "insights", insights)
+
+
+def upsert_insight(insight: Dict) -> None:
+    """Store ``insight``, replacing any previous one for the same assessment, in one locked step."""
     with _LOCK:
-        with _USERS_FILE.open("w", encoding="utf-8") as f:
-            json.dump({"users": users}, f, indent=2, ensure_ascii=False)
+        insights = [i for i in load_insights() if i.get("assessment_id") != insight["assessment_id"]]
+        insights.append(insight)
+        _write_items_locked(_INSIGHTS_FILE, "insights", insights)
+
+
+async def load_assessments_async() -> List[Dict]:
+    return await asyncio.to_thread(load_assessments)
+
+
+async def load_users_async() -> List[Dict]:
+    return await asyncio.to_thread(load_users)
+
+
+async def load_insights_async() -> List[Dict]:
+    return await asyncio.to_thread(load_insights)
+
+
+async def upsert_insight_async(insight: Dict) -> None:
+    await asyncio.to_thread(upsert_insight, insight)
@@ -0,0 +1,16 @@
+# Lives at the repository root so pytest puts the root on sys.path and
+# ``import app`` resolves to the package when running plain ``pytest``.
+import pytest
+
+from app import storage
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point storage at empty data files in a temporary directory."""
+    monkeypatch.setattr(storage, "_DATA_DIR", tmp_path)
+    monkeypatch.setattr(storage, "_ASSESSMENTS_FILE", tmp_path / "assessments.json")
+    monkeypatch.setattr(storage, "_USERS_FILE", tmp_path / "users.json")
+    monkeypatch.setattr(storage, "_INSIGHTS_FILE", tmp_path / "insights.json")
+    monkeypatch.setattr(storage, "_SNAPSHOT", {})
+    return tmp_path
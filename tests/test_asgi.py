@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app import create_app
+from app.asgi import AsyncApp
+from app.services import Assessment, save_assessments
+
+OWNER = {"user_email": "owner@example.com", "user_role": "standard"}
+OTHER = {"user_email": "other@example.com", "user_role": "standard"}
+
+
+async def _no_fallback(scope, receive, send):
+    raise AssertionError(f"{scope['path']} should be handled natively")
+
+
+@pytest.fixture
+def flask_app(data_dir):
+    save_assessments([
+        Assessment(
+            id="a1",
+            assessed_by=OWNER["user_email"],
+            full_name="Pero Perić",
+            position="Direktor",
+            management_level="B-1",
+            dimensions={},
+            adequacy=3.0,
+            potential=3.0,
+            category="Razvijati",
+        )
+    ])
+    return create_app()
+
+
+def cookie_for(app, session):
+    return app.session_interface.get_signing_serializer(app).dumps(session)
+
+
+def call_asgi(app, path, cookie=None):
+    headers = [(b"cookie", f"{app.config['SESSION_COOKIE_NAME']}={cookie}".encode())] if cookie else []
+    scope = {"type": "http", "method": "GET", "path": path, "root_path": "", "headers": headers}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(AsyncApp(app, _no_fallback)(scope, receive, send))
+    start, body = messages
+    return start["status"], dict(start["headers"]), body["body"]
+
+
+def call_flask(app, path, cookie=None):
+    client = app.test_client()
+    if cookie:
+        client.set_cookie(app.config["SESSION_COOKIE_NAME"], cookie)
+    return client.get(path)
+
+
+@pytest.mark.parametrize("cookie", [None, "tampered"])
+def test_requests_without_a_valid_session_redirect_to_login(flask_app, cookie):
+    if cookie == "tampered":
+        cookie = cookie_for(flask_app, {**OWNER, "user_role": "master"})[:-2] + "xx"
+
+    status, headers, _ = call_asgi(flask_app, "/api/assessments/a1", cookie)
+    response = call_flask(flask_app, "/api/assessments/a1", cookie)
+
+    assert status == response.status_code == 302
+    assert headers[b"location"].decode() == response.headers["Location"] == "/login"
+
+
+@pytest.mark.parametrize(
+    "session, path, expected",
+    [
+        (OWNER, "/api/assessments/a1", 200),
+        (OTHER, "/api/assessments/a1", 403),
+        (OWNER, "/api/assessments/missing", 404),
+        (OTHER, "/api/insights/a1", 403),
+        (OWNER, "/api/insights/missing", 404),
+    ],
+)
+def test_native_routes_match_flask_access_rules(flask_app, session, path, expected):
+    cookie = cookie_for(flask_app, session)
+
+    status, _, body = call_asgi(flask_app, path, cookie)
+    response = call_flask(flask_app, path, cookie)
+
+    assert status == response.status_code == expected
+    assert flask_app.json.loads(body) == response.get_json()
+
+
+def test_assessment_list_only_shows_own_records(flask_app):
+    status, _, body = call_asgi(flask_app, "/api/assessments", cookie_for(flask_app, OTHER))
+
+    assert status == 200
+    assert flask_app.json.loads(body) == []
@@ -0,0 +1,133 @@
+import pytest
+
+from app.consolidation import ConsolidationIndex, person_key
+from app.domain import ALL_DIMENSIONS
+from app.services import Assessment
+
+
+def make_assessment(assessment_id, scores, full_name="Pero Perić", position="Direktor", assessed_by="a@example.com"):
+    if isinstance(scores, int):
+        scores = {dim: scores for dim in ALL_DIMENSIONS}
+    return Assessment(
+        id=assessment_id,
+        assessed_by=assessed_by,
+        full_name=full_name,
+        position=position,
+        management_level="B-1",
+        dimensions=dict(scores),
+        adequacy=0.0,
+        potential=0.0,
+        category="",
+    )
+
+
+def test_person_key_ignores_case_diacritics_and_whitespace():
+    assert person_key("  PERO   perić ", "Direktor  Čvora") == person_key("Pero Peric", "direktor cvora")
+
+
+def test_single_rater_has_no_agreement():
+    index = ConsolidationIndex()
+    index.add(make_assessment("1", 3))
+
+    [person] = index.people()
+    assert person.rater_count == 1
+    assert person.dimensions["A"] == 3
+    assert person.dimension_spread["A"] == 0
+    assert person.agreement is None
+
+
+def test_several_raters_are_averaged_with_spread_and_agreement():
+    index = ConsolidationIndex()
+    index.add(make_assessment("1", 2, assessed_by="a@example.com"))
+    index.add(make_assessment("2", 4, full_name="pero peric", assessed_by="b@example.com"))
+
+    [person] = index.people()
+    assert person.rater_count == 2
+    assert person.assessors == ["a@example.com", "b@example.com"]
+    assert person.dimensions == {dim: 3 for dim in ALL_DIMENSIONS}
+    assert person.dimension_spread == {dim: 1 for dim in ALL_DIMENSIONS}
+    assert person.agreement == 0.5
+    assert person.adequacy == 3 and person.potential == 3
+
+
+def test_identical_ratings_agree_fully():
+    index = ConsolidationIndex()
+    index.add(make_assessment("1", 4))
+    index.add(make_assessment("2", 4, assessed_by="b@example.com"))
+
+    [person] = index.people()
+    assert person.agreement == 1
+
+
+def test_sync_applies_updates_incrementally():
+    index = ConsolidationIndex()
+    first = make_assessment("1", 2)
+    second = make_assessment("2", 4, assessed_by="b@example.com")
+    assert index.sync([first, second]) == 2
+    assert index.sync([first, second]) == 0
+
+    updated = make_assessment("2", 2, assessed_by="b@example.com")
+    assert index.sync([first, updated]) == 1
+
+    [person] = index.people()
+    assert person.dimensions["A"] == 2
+    assert person.dimension_spread["A"] == 0
+    assert person.agreement == 1
+
+
+def test_update_moves_record_to_another_person():
+    index = ConsolidationIndex()
+    index.sync([make_assessment("1", 2), make_assessment("2", 4, assessed_by="b@example.com")])
+
+    index.sync([make_assessment("1", 2), make_assessment("2", 4, full_name="Ana Anić", assessed_by="b@example.com")])
+
+    people = {person.full_name: person for person in index.people()}
+    assert set(people) == {"Ana Anić", "Pero Perić"}
+    assert people["Pero Perić"].dimensions["A"] == 2
+    assert people["Pero Perić"].agreement is None
+    assert people["Ana Anić"].dimensions["A"] == 4
+
+
+def test_removing_a_member_recomputes_the_group():
+    index = ConsolidationIndex()
+    index.add(make_assessment("1", 2))
+    index.add(make_assessment("2", 4, assessed_by="b@example.com"))
+
+    index.remove("2")
+
+    [person] = index.people()
+    assert person.assessment_ids == ["1"]
+    assert person.dimensions["A"] == 2
+    assert person.agreement is None
+
+
+def test_removing_the_last_member_drops_the_person():
+    index = ConsolidationIndex()
+    index.sync([make_assessment("1", 3), make_assessment("2", 5, full_name="Ana Anić")])
+
+    index.sync([make_assessment("2", 5, full_name="Ana Anić")])
+
+    assert [person.full_name for person in index.people()] == ["Ana Anić"]
+
+
+def test_incomplete_records_are_not_consolidated():
+    index = ConsolidationIndex()
+    partial = make_assessment("2", {dim: 4 for dim in ALL_DIMENSIONS[:-1]}, assessed_by="b@example.com")
+
+    index.sync([make_assessment("1", 2), partial])
+
+    [person] = index.people()
+    assert person.rater_count == 1
+    assert person.dimensions["A"] == 2
+    with pytest.raises(ValueError):
+        index.add(partial)
+
+
+def test_record_that_becomes_incomplete_is_removed():
+    index = ConsolidationIndex()
+    index.sync([make_assessment("1", 2), make_assessment("2", 4, assessed_by="b@example.com")])
+
+    index.sync([make_assessment("1", 2), make_assessment("2", {"A": 4}, assessed_by="b@example.com")])
+
+    [person] = index.people()
+    assert person.assessment_ids == ["1"]
@@ -0,0 +1,53 @@
+import threading
+
+from app import storage
+from app.domain import ALL_DIMENSIONS
+from app.services import Assessment, InsightService
+
+
+def make_assessment(assessment_id):
+    return Assessment(
+        id=assessment_id,
+        assessed_by="a@example.com",
+        full_name="Pero Perić",
+        position="Direktor",
+        management_level="B-1",
+        dimensions={dim: 3 for dim in ALL_DIMENSIONS},
+        adequacy=3.0,
+        potential=3.0,
+        category="Razvijati",
+    )
+
+
+def test_concurrent_upserts_keep_every_insight(data_dir):
+    def store(index):
+        storage.upsert_insight({"assessment_id": str(index), "fingerprint": "f", "content": f"uvid {index}"})
+
+    threads = [threading.Thread(target=store, args=(i,)) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(int(item["assessment_id"]) for item in storage.load_insights()) == list(range(20))
+
+
+def test_upsert_replaces_the_previous_insight(data_dir):
+    storage.upsert_insight({"assessment_id": "1", "fingerprint": "old", "content": "staro"})
+    storage.upsert_insight({"assessment_id": "1", "fingerprint": "new", "content": "novo"})
+
+    assert storage.load_insights() == [{"assessment_id": "1", "fingerprint": "new", "content": "novo"}]
+
+
+def test_cached_insights_only_returns_matching_fingerprints(data_dir):
+    service = InsightService()
+    current = make_assessment("1")
+    stale = make_assessment("2")
+    storage.upsert_insight({
+        "assessment_id": "1",
+        "fingerprint": service._fingerprint(service._build_prompt(current)),
+        "content": "aktualno",
+    })
+    storage.upsert_insight({"assessment_id": "2", "fingerprint": "outdated", "content": "zastarjelo"})
+
+    assert service.cached_insights([current, stale, make_assessment("3")]) == {"1": "aktualno"}
@@ -0,0 +1,112 @@
+import json
+import os
+import subprocess
+
+import pytest
+
+from app import metrics
+from app.metrics import Counter, Histogram
+
+
+@pytest.fixture
+def clean_metrics():
+    for metric in metrics.COLLECTED:
+        metric.reset()
+    yield
+    for metric in metrics.COLLECTED:
+        metric.reset()
+
+
+@pytest.fixture
+def multiprocess_dir(tmp_path, monkeypatch, clean_metrics):
+    monkeypatch.setattr(metrics, "_MULTIPROCESS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def dead_pid():
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+def write_process_file(directory, pid, series):
+    (directory / f"metrics-{pid}.json").write_text(json.dumps({"pid": pid, "metrics": series}), encoding="utf-8")
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count():
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, ("/",))
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/",le="0.1"} 2',
+        'latency_seconds_bucket{route="/",le="1"} 3',
+        'latency_seconds_bucket{route="/",le="+Inf"} 4',
+        'latency_seconds_sum{route="/"} 3.65',
+        'latency_seconds_count{route="/"} 4',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("requests_total", "Requests.", ("route",))
+    counter.inc(('a\\b "c"\nd',))
+
+    assert counter.render()[-1] == 'requests_total{route="a\\\\b \\"c\\"\\nd"} 1'
+
+
+def test_unlabelled_counter_renders_without_braces():
+    counter = Counter("events_total", "Events.")
+    counter.inc(amount=2.5)
+
+    assert counter.render()[-1] == "events_total 2.5"
+
+
+def test_cache_hit_ratio_is_computed_at_scrape_time():
+    hits = Counter("hits_total", "Hits.", ("cache",))
+    misses = Counter("misses_total", "Misses.", ("cache",))
+    ratio = metrics._cache_hit_ratio_gauge(hits, misses)
+    hits.inc(("storage",), 3)
+    misses.inc(("storage",))
+    misses.inc(("insights",))
+
+    assert ratio.render()[2:] == ['cache_hit_ratio{cache="insights"} 0', 'cache_hit_ratio{cache="storage"} 0.75']
+
+
+def test_process_files_are_merged(multiprocess_dir):
+    gone = dead_pid()
+    metrics.record_cache("storage", True)
+    metrics.STARTUP_SECONDS.set(0.5)
+    write_process_file(multiprocess_dir, gone, {
+        "cache_hits_total": [[["storage"], 2]],
+        "cache_misses_total": [[["storage"], 1]],
+        "app_startup_seconds": [[[], 0.25]],
+        "http_request_duration_seconds": [[["GET", "/"], [1] + [0] * 11, 0.004]],
+    })
+
+    output = metrics.render_latest()
+
+    assert 'cache_hits_total{cache="storage"} 3' in output
+    assert 'cache_misses_total{cache="storage"} 1' in output
+    assert 'cache_hit_ratio{cache="storage"} 0.75' in output
+    assert f'app_startup_seconds{{pid="{os.getpid()}"}} 0.5' in output
+    assert f'pid="{gone}"' not in output
+    assert 'http_request_duration_seconds_count{method="GET",route="/"} 1' in output
+
+
+def test_forked_worker_starts_from_zero(multiprocess_dir):
+    metrics.record_storage_read("assessments.json", 100, 0.001)
+    metrics.flush()
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child
+        metrics._reset_after_fork()
+        metrics.record_storage_read("assessments.json", 10, 0.001)
+        metrics.flush()
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    output = metrics.render_latest()
+    assert 'storage_reads_total{file="assessments.json"} 2' in output
+    assert 'storage_read_bytes_total{file="assessments.json"} 110' in output
@@ -0,0 +1,68 @@
+import io
+import zipfile
+
+import pytest
+
+from app.domain import ALL_DIMENSIONS
+from app.reports import report_basename, write_reports_zip
+from app.services import Assessment
+
+
+def make_assessment(assessment_id, full_name="Pero Perić"):
+    return Assessment(
+        id=assessment_id,
+        assessed_by="a@example.com",
+        full_name=full_name,
+        position="Direktor",
+        management_level="B-1",
+        dimensions={dim: 3 for dim in ALL_DIMENSIONS},
+        adequacy=3.0,
+        potential=3.0,
+        category="Razvijati",
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_archive_is_valid_and_holds_one_report_per_assessment(data_dir, workers):
+    assessments = [make_assessment(f"{i:04d}-id", full_name=f"Osoba {i}") for i in range(150)]
+    buffer = io.BytesIO()
+
+    assert write_reports_zip(assessments, buffer, workers=workers) == 150
+
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == [f"osoba-{i}-{i:04d}-id.html" for i in range(150)]
+        info = archive.getinfo("osoba-7-0007-id.html")
+        assert info.create_system == 3
+        assert info.external_attr >> 16 == 0o644
+        html = archive.read(info).decode("utf-8")
+    assert "Osoba 7" in html
+    assert "Direktor" in html
+
+
+def test_archive_can_be_streamed_to_a_non_seekable_file(data_dir):
+    class Stream(io.RawIOBase):
+        def __init__(self):
+            self.data = bytearray()
+
+        def writable(self):
+            return True
+
+        def write(self, chunk):
+            self.data += chunk
+            return len(chunk)
+
+    stream = Stream()
+    write_reports_zip([make_assessment("1"), make_assessment("2")], stream, workers=1)
+
+    with zipfile.ZipFile(io.BytesIO(bytes(stream.data))) as archive:
+        assert archive.testzip() is None
+        assert len(archive.namelist()) == 2
+
+
+def test_names_stay_unique_when_ids_share_a_prefix():
+    first = make_assessment("12345678-aaaa")
+    second = make_assessment("12345678-bbbb")
+
+    assert report_basename(first) != report_basename(second)
+    assert report_basename(first) == "pero-peric-12345678-aaaa"